@@ -20,23 +20,31 @@ from __future__ import absolute_import, unicode_literals
 
 import hashlib
 import inspect
+import io
+import json
 import os
-import re
 import sys
+import time
 from contextlib import contextmanager
 from platform import uname
 from pprint import pformat
+from types import FunctionType, ModuleType
 
-import six
-from six.moves import cPickle as pickle
 from kodi_six import xbmc
 from kodi_six.xbmcaddon import Addon
 
 try:
-    from typing import Text, Dict, Callable, Generator  # pylint: disable=unused-import
+    # pylint: disable=unused-import
+    from typing import Text, Dict, Callable, Generator, Optional, Any
 except ImportError:
     pass
 
+try:
+    from types import ClassType  # Python 2 old-style classes
+    _OPAQUE_TYPES = (ModuleType, type, ClassType, FunctionType)
+except ImportError:
+    _OPAQUE_TYPES = (ModuleType, type, FunctionType)
+
 
 ADDON = Addon()
 ADDON_ID = ADDON.getAddonInfo('id')
@@ -46,26 +54,32 @@ ADDON_PROFILE_DIR = xbmc.translatePath(ADDON.getAddonInfo('profile'))
 ADDON_DIR = xbmc.translatePath(ADDON.getAddonInfo('path'))
 ADDON_ICON = xbmc.translatePath(ADDON.getAddonInfo('icon'))
 
-if not os.path.exists(ADDON_PROFILE_DIR):
+try:
     os.mkdir(ADDON_PROFILE_DIR)
+except OSError:
+    if not os.path.isdir(ADDON_PROFILE_DIR):
+        raise
 
 
 class logger(object):  # pylint: disable=invalid-name
     # pylint: disable=missing-docstring
-    FORMAT = '{id} [v.{version}] - {filename}:{lineno} - {message}'
+    __slots__ = ()
+    DEBUG_CHECK_INTERVAL = 60.0
+    _basenames = {}  # type: Dict[Text, Text]
+    _debug_enabled = False
+    _debug_checked_at = 0.0
 
     @classmethod
     def _write_message(cls, message, level=xbmc.LOGDEBUG):
         # type: (Text, int) -> None
-        curr_frame = inspect.currentframe()
+        frame = sys._getframe(2)  # pylint: disable=protected-access
+        co_filename = frame.f_code.co_filename
+        filename = cls._basenames.get(co_filename)
+        if filename is None:
+            filename = cls._basenames[co_filename] = os.path.basename(co_filename)
         xbmc.log(
-            cls.FORMAT.format(
-                id=ADDON_ID,
-                version=ADDON_VERSION,
-                filename=os.path.basename(curr_frame.f_back.f_back.f_code.co_filename),
-                lineno=curr_frame.f_back.f_back.f_lineno,
-                message=message
-            ),
+            '%s [v.%s] - %s:%s - %s' % (ADDON_ID, ADDON_VERSION, filename, frame.f_lineno,
+                                        message),
             level
         )
 
@@ -84,14 +98,32 @@ class logger(object):  # pylint: disable=invalid-name
         # type: (Text) -> None
         cls._write_message(message, xbmc.LOGERROR)
 
+    @classmethod
+    def debug_enabled(cls):
+        # type: () -> bool
+        """
+        Check if Kodi debug logging is enabled
+
+        The setting is re-read from Kodi at most once per
+        ``DEBUG_CHECK_INTERVAL`` seconds.
+        """
+        now = time.time()
+        if now - cls._debug_checked_at > cls.DEBUG_CHECK_INTERVAL:
+            cls._debug_enabled = xbmc.getCondVisibility('System.GetBool(debug.showloginfo)')
+            cls._debug_checked_at = now
+        return cls._debug_enabled
+
     @classmethod
     def debug(cls, message):
         # type: (Text) -> None
-        cls._write_message(message, xbmc.LOGDEBUG)
+        if cls.debug_enabled():
+            cls._write_message(message, xbmc.LOGDEBUG)
 
 
 class LocalizationService(object):
     """Emulate GNU Gettext by mapping English UI strings to their numeric string IDs"""
+    __slots__ = ('_en_gb_string_po_path', '_string_mapping_path', '_mapping',
+                 '_localized_cache')
 
     class LocalizationError(Exception):  # pylint: disable=missing-docstring
         pass
@@ -103,39 +135,66 @@ class LocalizationService(object):
         )
         if not os.path.exists(self._en_gb_string_po_path):
             raise self.LocalizationError('Missing English strings.po localization file')
-        self._string_mapping_path = os.path.join(ADDON_PROFILE_DIR, 'strings-map.pickle')
+        self._string_mapping_path = os.path.join(ADDON_PROFILE_DIR, 'strings-map.json')
         self._mapping = self._load_strings_mapping()  # type: Dict[Text, int]
+        self._localized_cache = {}  # type: Dict[Text, Text]
 
     def _load_strings_po(self):  # pylint: disable=missing-docstring
         # type: () -> bytes
         with open(self._en_gb_string_po_path, 'rb') as fo:
             return fo.read()
 
+    def _get_strings_po_md5(self):  # pylint: disable=missing-docstring
+        # type: () -> Text
+        md5 = hashlib.md5()
+        with open(self._en_gb_string_po_path, 'rb') as fo:
+            for chunk in iter(lambda: fo.read(65536), b''):
+                md5.update(chunk)
+        return md5.hexdigest()
+
+    @staticmethod
+    def _remove_legacy_strings_mapping():
+        # type: () -> None
+        """Remove the mapping file that was stored in pickle format by older versions"""
+        try:
+            os.remove(os.path.join(ADDON_PROFILE_DIR, 'strings-map.pickle'))
+        except OSError:
+            pass
+
     def _load_strings_mapping(self):
         # type: () -> Dict[Text, int]
         """
         Load mapping of English UI strings to their IDs
 
         If a mapping file is missing or English strins.po file has been updated,
-        a new mapping file is created.
+        a new mapping file is created. The modification time and the size
+        of strings.po are checked first so that the file is not read
+        and hashed if it has not been touched.
 
         :return: UI strings mapping
         """
-        strings_po = self._load_strings_po()
-        strings_po_md5 = hashlib.md5(strings_po).hexdigest()
+        stat = os.stat(self._en_gb_string_po_path)
+        strings_po_stat = [stat.st_mtime, stat.st_size]
         try:
-            with open(self._string_mapping_path, 'rb') as fo:
-                mapping = pickle.load(fo)
-            if mapping['md5'] != strings_po_md5:
-                raise IOError('English strings.po has been updated')
-        except IOError:
-            strings_mapping = self._parse_strings_po(strings_po.decode('utf-8'))
+            with io.open(self._string_mapping_path, 'r', encoding='utf-8') as fo:
+                mapping = json.load(fo)
+        except (IOError, ValueError):
+            mapping = None
+        if not isinstance(mapping, dict) or 'strings' not in mapping:
+            self._remove_legacy_strings_mapping()
+            mapping = {}
+        if mapping.get('stat') == strings_po_stat:
+            return mapping['strings']
+        strings_po_md5 = self._get_strings_po_md5()
+        if mapping.get('md5') != strings_po_md5:
+            strings_po = self._load_strings_po()
             mapping = {
-                'strings': strings_mapping,
+                'strings': self._parse_strings_po(strings_po.decode('utf-8')),
                 'md5': strings_po_md5,
             }
-            with open(self._string_mapping_path, 'wb') as fo:
-                pickle.dump(mapping, fo, protocol=2)
+        mapping['stat'] = strings_po_stat
+        with io.open(self._string_mapping_path, 'w', encoding='utf-8') as fo:
+            fo.write(json.dumps(mapping, ensure_ascii=False))
         return mapping['strings']
 
     @staticmethod
@@ -148,8 +207,20 @@ class LocalizationService(object):
         :param strings_po: the content of strings.po file as a text string
         :return: UI strings mapping
         """
-        id_string_pairs = re.findall(r'^msgctxt "#(\d+?)"\r?\nmsgid "(.*)"\r?$', strings_po, re.M)
-        return {string: int(string_id) for string_id, string in id_string_pairs if string}
+        mapping = {}
+        lines = strings_po.splitlines()
+        for i in range(len(lines) - 1):
+            ctxt_line = lines[i]
+            if not (ctxt_line.startswith('msgctxt "#') and ctxt_line.endswith('"')):
+                continue
+            msgid_line = lines[i + 1]
+            if not (msgid_line.startswith('msgid "') and msgid_line.endswith('"')):
+                continue
+            string_id = ctxt_line[10:-1]
+            string = msgid_line[7:-1]
+            if string and string_id.isdigit():
+                mapping[string] = int(string_id)
+        return mapping
 
     def gettext(self, en_string):
         # type: (Text) -> Text
@@ -159,15 +230,37 @@ class LocalizationService(object):
         :param en_string: English UI string
         :return: localized UI string
         """
+        localized_string = self._localized_cache.get(en_string)
+        if localized_string is not None:
+            return localized_string
         try:
             string_id = self._mapping[en_string]
         except KeyError:
             raise self.LocalizationError(
                 'Unable to find English string "{}" in strings.po'.format(en_string))
-        return ADDON.getLocalizedString(string_id)
+        localized_string = ADDON.getLocalizedString(string_id)
+        self._localized_cache[en_string] = localized_string
+        return localized_string
 
 
-GETTEXT = LocalizationService().gettext
+_localization_service = None  # type: Optional[LocalizationService]
+
+
+def GETTEXT(en_string):  # pylint: disable=invalid-name
+    # type: (Text) -> Text
+    """
+    Return a localized UI string by an English source string
+
+    :class:`LocalizationService` is created on the first call,
+    so importing this module does not touch strings.po.
+
+    :param en_string: English UI string
+    :return: localized UI string
+    """
+    global _localization_service  # pylint: disable=global-statement
+    if _localization_service is None:
+        _localization_service = LocalizationService()
+    return _localization_service.gettext(en_string)
 
 
 def _format_vars(variables):
@@ -175,29 +268,50 @@ def _format_vars(variables):
     """
     Format variables dictionary
 
+    Modules, classes and functions are skipped and nested values
+    are truncated to keep the output compact.
+
     :param variables: variables dict
     :return: formatted string with sorted ``var = val`` pairs
     """
-    var_list = [(var, val) for var, val in six.iteritems(variables)
-                if not (var.startswith('__') or var.endswith('__'))]
-    var_list.sort(key=lambda i: i[0])
-    lines = []
-    for var, val in var_list:
-        lines.append('{} = {}'.format(var, pformat(val)))
-    return '\n'.join(lines)
+    var_list = sorted((var, val) for var, val in variables.items()
+                      if not (var[:2] == '__' or var[-2:] == '__'
+                              or isinstance(val, _OPAQUE_TYPES)))
+    return '\n'.join('{} = {}'.format(var, pformat(val, depth=3, width=120))
+                     for var, val in var_list)
 
 
 def _format_code_context(frame_info):
     # type: (tuple) -> Text
-    context = ''
-    if frame_info[4] is not None:
-        for i, line in enumerate(frame_info[4], frame_info[2] - frame_info[5]):
-            if i == frame_info[2]:
-                context += '{}:>{}'.format(six.text_type(i).rjust(5), line)
-            else:
-                context += '{}: {}'.format(six.text_type(i).rjust(5), line)
-    return context
+    if frame_info[4] is None:
+        return ''
+    lines = []
+    for i, line in enumerate(frame_info[4], frame_info[2] - frame_info[5]):
+        prefix = '>' if i == frame_info[2] else ' '
+        lines.append('{}:{}{}'.format(str(i).rjust(5), prefix, line))
+    return ''.join(lines)
+
+
+_system_info = None  # type: Optional[Dict[Text, Any]]
+
 
+def _get_system_info():
+    # type: () -> Dict[Text, Any]
+    """
+    Get system info for exception diagnostics
+
+    The info does not change during a Kodi session, so it is queried
+    on the first call only.
+    """
+    global _system_info  # pylint: disable=global-statement
+    if _system_info is None:
+        _system_info = {
+            'system_info': uname(),
+            'python_version': sys.version.replace('\n', ' '),
+            'os_info': xbmc.getInfoLabel('System.OSVersionInfo'),
+            'kodi_version': xbmc.getInfoLabel('System.BuildVersion'),
+        }
+    return _system_info
 
 EXCEPTION_TEMPLATE = """
 *********************************** Unhandled exception detected ***********************************
@@ -265,17 +379,14 @@ def debug_exception(logger_func=logger.error):
         message = EXCEPTION_TEMPLATE.format(
             exc_type=type(exc),
             exc=exc,
-            system_info=uname(),
-            python_version=sys.version.replace('\n', ' '),
-            os_info=xbmc.getInfoLabel('System.OSVersionInfo'),
-            kodi_version=xbmc.getInfoLabel('System.BuildVersion'),
             file_path=frame_info[1],
             lineno=frame_info[2],
-            sys_argv=pformat(sys.argv),
-            sys_path=pformat(sys.path),
+            sys_argv=' '.join(repr(arg) for arg in sys.argv),
+            sys_path='\n'.join(repr(path) for path in sys.path),
             code_context=_format_code_context(frame_info),
             global_vars=_format_vars(frame_info[0].f_globals),
-            local_vars=_format_vars(frame_info[0].f_locals)
+            local_vars=_format_vars(frame_info[0].f_locals),
+            **_get_system_info()
         )
         logger_func(message)
         raise exc
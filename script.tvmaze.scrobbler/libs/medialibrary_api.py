@@ -19,18 +19,22 @@
 from __future__ import absolute_import, unicode_literals
 
 import json
-from pprint import pformat
 
 from kodi_six import xbmc
 
 from .kodi_service import logger
 
 try:
-    from typing import Text, Optional, List, Dict, Any, Union  # pylint: disable=unused-import
+    # pylint: disable=unused-import
+    from typing import Text, Optional, List, Dict, Any, Union, Tuple
 except ImportError:
     pass
 
 
+# Episode properties consumed by the scrobbler
+_EPISODE_PROPERTIES = ['season', 'episode', 'playcount', 'dateadded', 'lastplayed']
+
+
 class NoDataError(Exception):  # pylint: disable=missing-docstring
     pass
 
@@ -43,10 +47,50 @@ def send_json_rpc(method, params=None):
     request = {'jsonrpc': '2.0', 'method': method, 'id': '1'}
     if params is not None:
         request['params'] = params
-    logger.debug('JSON-RPC request:\n{0}'.format(pformat(request)))
-    json_reply = json.loads(xbmc.executeJSONRPC(json.dumps(request)))
-    logger.debug('JSON-RPC reply:\n{0}'.format(pformat(json_reply)))
-    return json_reply['result']
+    request_json = json.dumps(request)
+    if logger.debug_enabled():
+        logger.debug('JSON-RPC request:\n{0}'.format(request_json))
+    reply_json = xbmc.executeJSONRPC(request_json)
+    if logger.debug_enabled():
+        logger.debug('JSON-RPC reply:\n{0}'.format(reply_json))
+    return json.loads(reply_json)['result']
+
+
+def send_json_rpc_batch(calls):
+    # type: (List[Tuple[Text, Optional[Dict[Text, Any]]]]) -> List[Optional[dict]]
+    """
+    Send a batch of JSON-RPC calls to Kodi in a single request
+
+    :param calls: the list of ``(method, params)`` tuples
+    :return: the list of call results in the same order as calls.
+        A call that has returned an error is represented by ``None``.
+    """
+    if not calls:
+        return []
+    batch = []
+    for call_id, (method, params) in enumerate(calls):
+        request = {'jsonrpc': '2.0', 'method': method, 'id': call_id}
+        if params is not None:
+            request['params'] = params
+        batch.append(request)
+    request_json = json.dumps(batch)
+    if logger.debug_enabled():
+        logger.debug('JSON-RPC batch request:\n{0}'.format(request_json))
+    reply_json = xbmc.executeJSONRPC(request_json)
+    if logger.debug_enabled():
+        logger.debug('JSON-RPC batch reply:\n{0}'.format(reply_json))
+    replies = json.loads(reply_json)
+    if not isinstance(replies, list):
+        logger.error('JSON-RPC batch request failed: {0}'.format(replies.get('error')))
+        return [None] * len(calls)
+    results = {}
+    for reply in replies:
+        if 'result' in reply:
+            results[reply['id']] = reply['result']
+        else:
+            logger.error('JSON-RPC batch call {0} failed: {1}'.format(
+                reply.get('id'), reply.get('error')))
+    return [results.get(call_id) for call_id in range(len(calls))]
 
 
 def get_tvshows():
@@ -74,6 +118,17 @@ def get_tvshows():
     return result['tvshows']
 
 
+def _get_episodes_params(tvshowid, filter_=None):
+    # type: (int, Optional[Dict[Text, Any]]) -> Dict[Text, Any]
+    params = {
+        'tvshowid': tvshowid,
+        'properties': _EPISODE_PROPERTIES,
+    }
+    if filter_ is not None:
+        params['filter'] = filter_
+    return params
+
+
 def get_episodes(tvshowid, filter_=None):
     # type: (int, Optional[Dict[Text, Any]]) -> List[Dict[Text, Any]]
     """
@@ -90,22 +145,31 @@ def get_episodes(tvshowid, filter_=None):
          u'episodeid': 1043,
          u'label': u'3x01. Parce Domine',
          u'playcount': 3,
-         u'season': 3,
-         u'tvshowid': 45}
+         u'season': 3}
     """
-    params = {
-        'tvshowid': tvshowid,
-        'properties': ['season', 'episode', 'playcount', 'tvshowid',
-                       'dateadded', 'lastplayed']
-    }
-    if filter_ is not None:
-        params['filter'] = filter_
-    result = send_json_rpc('VideoLibrary.GetEpisodes', params)
+    result = send_json_rpc('VideoLibrary.GetEpisodes', _get_episodes_params(tvshowid, filter_))
     if not result.get('episodes'):
         raise NoDataError('TV show {} has no episodes'.format(tvshowid))
     return result['episodes']
 
 
+def get_episodes_bulk(tvshowids):
+    # type: (List[int]) -> Dict[int, Optional[List[Dict[Text, Any]]]]
+    """
+    Get episodes for several TV shows in a single JSON-RPC batch request
+
+    :param tvshowids: internal Kodi database IDs for TV shows
+    :return: the mapping of TV show IDs to the lists of episode data.
+        A show without episodes is mapped to an empty list and a show
+        for which Kodi has returned an error is mapped to ``None``.
+    """
+    calls = [('VideoLibrary.GetEpisodes', _get_episodes_params(tvshowid))
+             for tvshowid in tvshowids]
+    results = send_json_rpc_batch(calls)
+    return {tvshowid: (result.get('episodes') or []) if result is not None else None
+            for tvshowid, result in zip(tvshowids, results)}
+
+
 def get_recent_episodes():
     # type: () -> List[Dict[Text, Any]]
     """
@@ -115,8 +179,7 @@ def get_recent_episodes():
     :raises NoDataError: if the Kodi library has no recent episodes
     """
     params = {
-        'properties': ['playcount', 'tvshowid', 'season', 'episode', 'uniqueid',
-                       'dateadded', 'lastplayed']
+        'properties': _EPISODE_PROPERTIES + ['tvshowid'],
     }
     result = send_json_rpc('VideoLibrary.GetRecentlyAddedEpisodes', params)
     if not result.get('episodes'):
@@ -151,16 +214,25 @@ def get_episode_details(episode_id):
     method = 'VideoLibrary.GetEpisodeDetails'
     params = {
         'episodeid': episode_id,
-        'properties': ['playcount', 'tvshowid', 'season', 'episode', 'uniqueid',
-                       'dateadded', 'lastplayed']
+        'properties': _EPISODE_PROPERTIES + ['tvshowid'],
     }
     return send_json_rpc(method, params)['episodedetails']
 
 
-def set_episode_playcount(episode_id, playcount=1, last_played=None):
-    # type: (int, int, Optional[Text]) -> None
-    original_playcount = get_episode_details(episode_id)['playcount']
-    if playcount != int(bool(original_playcount)):
+def set_episode_playcount(episode_id, playcount=1, last_played=None, current_playcount=None):
+    # type: (int, int, Optional[Text], Optional[int]) -> None
+    """
+    Set episode playcount if its watched status differs
+
+    :param episode_id: episode Kodi database ID
+    :param playcount: new playcount
+    :param last_played: last played time string
+    :param current_playcount: current episode playcount if already known.
+        If ``None``, it is queried from Kodi.
+    """
+    if current_playcount is None:
+        current_playcount = get_episode_details(episode_id)['playcount']
+    if playcount != int(bool(current_playcount)):
         method = 'VideoLibrary.SetEpisodeDetails'
         params = {'episodeid': episode_id, 'playcount': playcount}
         if last_played is not None:
@@ -235,7 +235,8 @@ def _check_and_set_episode_playcount(kodi_tvshowid, tvmaze_episode):
             with PulledEpisodesDb() as database:
                 database.upsert_episode(kodi_episode_info['episodeid'])
             medialib.set_episode_playcount(kodi_episode_info['episodeid'],
-                                           last_played=last_played)
+                                           last_played=last_played,
+                                           current_playcount=kodi_episode_info['playcount'])
 
 
 def _pull_watched_episodes(kodi_tv_shows=None):
@@ -296,23 +297,39 @@ def _push_all_episodes(kodi_tv_shows):
     success = True
     with gui.background_progress_dialog(_('TVmaze Scrobbler'), _('Syncing episodes')) as dialog:
         shows_count = len(kodi_tv_shows)
-        for n, show in enumerate(kodi_tv_shows, 1):
-            percent = int(100 * n / shows_count)
+
+        def update_progress(phase, n, show):
+            # Resolving TVmaze IDs and pushing episodes take a half of the progress each
+            percent = int(50 * (phase + n / shows_count))
             message = _(r'Syncing episodes for show \"{show_name}\": {count}/{total}').format(
                 show_name=show['label'],
                 count=n,
                 total=shows_count
             )
             dialog.update(percent, _('TVmaze Scrobbler'), message)
+
+        tvmaze_ids = {}
+        for n, show in enumerate(kodi_tv_shows, 1):
+            update_progress(0, n, show)
             tvmaze_id = _get_tvmaze_id(show)
             if tvmaze_id is None:
                 logger.error(
                     'Unable to determine TVmaze id from show info: {}'.format(pformat(show)))
                 success = False
                 continue
-            try:
-                episodes = medialib.get_episodes(show['tvshowid'])
-            except medialib.NoDataError:
+            tvmaze_ids[show['tvshowid']] = tvmaze_id
+        kodi_episodes = medialib.get_episodes_bulk(list(tvmaze_ids))
+        for n, show in enumerate(kodi_tv_shows, 1):
+            update_progress(1, n, show)
+            tvmaze_id = tvmaze_ids.get(show['tvshowid'])
+            if tvmaze_id is None:
+                continue
+            episodes = kodi_episodes[show['tvshowid']]
+            if episodes is None:
+                logger.error('Unable to get episodes for show "{}"'.format(show['label']))
+                success = False
+                continue
+            if not episodes:
                 logger.warning('TV show "{}" has no episodes'.format(show['label']))
                 continue
             episodes_for_tvmaze = _prepare_episode_list(episodes)